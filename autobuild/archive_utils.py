@@ -1,6 +1,13 @@
+import io
 import multiprocessing
+import os
+import posixpath
+import queue
+import stat
 import tarfile
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
 class ArchiveType:
@@ -18,17 +25,28 @@ _ARCHIVE_MAGIC_NUMBERS = {
     b"\x28\xb5\x2f\xfd": ArchiveType.ZST,  # Zstandard-Dateisignatur
 }
 
+# Verteiltabelle über das erste Byte: Jeder Eintrag enthält nur die (wenigen)
+# Signaturen, die mit diesem Byte beginnen, sodass die Erkennung unabhängig
+# von der Anzahl bekannter Signaturen bleibt
+_ARCHIVE_MAGIC_DISPATCH = [()] * 256
+for _magic, _f_type in _ARCHIVE_MAGIC_NUMBERS.items():
+    _ARCHIVE_MAGIC_DISPATCH[_magic[0]] += ((_magic, _f_type),)
+del _magic, _f_type
+
 # Maximale Länge der Signaturen für den Vergleich
 _ARCHIVE_MAGIC_NUMBERS_MAX = max(len(x) for x in _ARCHIVE_MAGIC_NUMBERS)
 
 def _archive_type_from_signature(filename: str):
     """Erkennt den Archivtyp anhand der Dateisignatur."""
-    with open(filename, "rb") as f:
+    # Ungepuffert öffnen: Es werden nur wenige Bytes benötigt
+    with open(filename, "rb", buffering=0) as f:
         # Liest den Anfang der Datei ein, um die Signatur zu prüfen
         head = f.read(_ARCHIVE_MAGIC_NUMBERS_MAX)
-        for magic, f_type in _ARCHIVE_MAGIC_NUMBERS.items():
-            if head.startswith(magic):  # Vergleicht mit bekannten Signaturen
-                return f_type
+    if not head:
+        return None  # Leere Datei
+    for magic, f_type in _ARCHIVE_MAGIC_DISPATCH[head[0]]:
+        if head.startswith(magic):  # Vergleicht mit bekannten Signaturen
+            return f_type
     return None  # Gibt None zurück, wenn keine Signatur übereinstimmt
 
 def _archive_type_from_extension(filename: str):
@@ -48,7 +66,23 @@ def detect_archive_type(filename: str):
     f_type = _archive_type_from_extension(filename)
     if f_type:  # Wenn der Typ durch die Endung erkannt wurde
         return f_type
-    return _archive_type_from_signature(filename)  # Ansonsten Signatur prüfen
+    # Ansonsten Signatur prüfen; das Ergebnis wird pro Dateistand
+    # zwischengespeichert. Der Schlüssel stammt aus einem einzigen os.stat(),
+    # da jede weitere Pfadauflösung teurer wäre als das Lesen der Signatur.
+    st = os.stat(filename)
+    key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    f_type = _SIGNATURE_CACHE.get(key, _SIGNATURE_UNKNOWN)
+    if f_type is _SIGNATURE_UNKNOWN:
+        f_type = _archive_type_from_signature(filename)
+        if len(_SIGNATURE_CACHE) >= _SIGNATURE_CACHE_MAX:
+            _SIGNATURE_CACHE.clear()
+        _SIGNATURE_CACHE[key] = f_type
+    return f_type
+
+# Signaturprüfungen nach (Gerät, Inode, Änderungszeit, Größe)
+_SIGNATURE_CACHE = {}
+_SIGNATURE_CACHE_MAX = 4096
+_SIGNATURE_UNKNOWN = object()
 
 def open_archive(filename: str) -> Union[tarfile.TarFile, zipfile.ZipFile]:
     """Öffnet ein Archiv abhängig vom erkannten Typ."""
@@ -62,30 +96,363 @@ def open_archive(filename: str) -> Union[tarfile.TarFile, zipfile.ZipFile]:
 
     return tarfile.open(filename, "r")  # Öffnet ein TAR-Archiv
 
+class ParallelExtractor:
+    """
+    Schreibt entpackte Dateien über einen Thread-Pool.
+
+    Archive lassen sich nur der Reihe nach lesen, daher liest der aufrufende
+    Thread die Einträge und übergibt die Inhalte; das Anlegen und Schreiben
+    der Dateien übernimmt der Pool. Verzeichnisse werden pro Pfad nur einmal
+    angelegt. Die Änderungszeit wird nur mit preserve_mtime gesetzt.
+
+    Dateien ab INLINE_SIZE Bytes werden im aufrufenden Thread blockweise
+    geschrieben statt gepuffert; insgesamt werden höchstens BUFFER_BYTES an
+    noch nicht geschriebenen Daten gehalten. Mehrere Einträge mit demselben
+    Ziel werden in Archivreihenfolge geschrieben, der letzte gewinnt.
+    """
+
+    INLINE_SIZE = 1 << 20
+    BUFFER_BYTES = 32 << 20
+
+    def __init__(self, path: str, *, max_workers=None, preserve_mtime=False):
+        self.root = os.path.abspath(path)
+        self.preserve_mtime = preserve_mtime
+        self._created = set()
+        # Begrenzt die Größe der gepufferten, noch nicht geschriebenen Daten
+        self._buffered = 0
+        self._buffer_free = threading.Condition()
+        # Ziel -> ausstehender Schreibvorgang
+        self._pending = {}
+        self._pool = ThreadPoolExecutor(max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if exc[0] is None:
+                self.wait()
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def target(self, name: str) -> str:
+        """Zielpfad für einen Archiveintrag; verweigert Pfade außerhalb des Ziels."""
+        target = os.path.normpath(os.path.join(self.root, name))
+        if os.path.commonpath([self.root, target]) != self.root:
+            raise tarfile.ExtractError("%r would be extracted outside %s"
+                                       % (name, self.root))
+        return target
+
+    def makedirs(self, directory: str):
+        if directory not in self._created:
+            os.makedirs(directory, exist_ok=True)
+            self._created.add(directory)
+
+    def wait_for(self, target: str):
+        """Wartet auf einen ausstehenden Schreibvorgang für dieses Ziel."""
+        future = self._pending.pop(target, None)
+        if future is not None:
+            future.result()
+
+    def write(self, name: str, data: bytes, mode: int, mtime: float):
+        """Schreibt eine reguläre Datei im Hintergrund."""
+        target = self.target(name)
+        self.makedirs(os.path.dirname(target))
+        # Ein früherer Eintrag mit gleichem Namen muss zuerst fertig sein
+        self.wait_for(target)
+        size = len(data)
+        with self._buffer_free:
+            # Eine einzelne Datei darf das Budget überschreiten, wenn sonst
+            # nichts gepuffert ist
+            while self._buffered and self._buffered + size > self.BUFFER_BYTES:
+                self._buffer_free.wait()
+            self._buffered += size
+        self._pending[target] = self._pool.submit(self._write, target, (data,), mode, mtime, size)
+
+    def write_inline(self, name: str, chunks, mode: int, mtime: float):
+        """Schreibt eine (große) reguläre Datei blockweise im aufrufenden Thread."""
+        target = self.target(name)
+        self.makedirs(os.path.dirname(target))
+        self.wait_for(target)
+        self._write(target, chunks, mode, mtime, 0)
+
+    def _write(self, target, chunks, mode, mtime, size):
+        try:
+            with open(target, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.chmod(target, mode)
+            if self.preserve_mtime:
+                os.utime(target, (mtime, mtime))
+        finally:
+            if size:
+                with self._buffer_free:
+                    self._buffered -= size
+                    self._buffer_free.notify_all()
+
+    def wait(self):
+        """Wartet auf alle ausstehenden Schreibvorgänge."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.result()
+
+def extractall_parallel(archive: tarfile.TarFile, path: str, members=None, *,
+                        max_workers=None, preserve_mtime=False):
+    """Entpackt ein TAR-Archiv und schreibt die regulären Dateien parallel."""
+    with ParallelExtractor(path, max_workers=max_workers,
+                           preserve_mtime=preserve_mtime) as extractor:
+        for member in (archive if members is None else members):
+            target = extractor.target(member.name)
+            if member.isreg():
+                f = archive.extractfile(member)
+                if member.size >= extractor.INLINE_SIZE:
+                    chunks = iter(lambda: f.read(extractor.INLINE_SIZE), b"")
+                    extractor.write_inline(member.name, chunks, member.mode, member.mtime)
+                else:
+                    extractor.write(member.name, f.read(), member.mode, member.mtime)
+            elif member.isdir():
+                extractor.makedirs(target)
+            else:
+                # Links und Sonderdateien können auf bereits geschriebene
+                # Dateien verweisen: ausstehende Schreibvorgänge abwarten
+                extractor.wait()
+                archive.extract(member, extractor.root, set_attrs=preserve_mtime)
+
+def has_libarchive() -> bool:
+    """Gibt an, ob das optionale Paket libarchive-c verfügbar ist."""
+    try:
+        import libarchive  # noqa: F401
+    except (ImportError, OSError):  # OSError: libarchive selbst fehlt
+        return False
+    return True
+
+def open_archive_fast(filename: str):
+    """
+    Liest ein Archiv jeden Typs in einem Durchgang mit libarchive (optionales
+    Paket libarchive-c). Liefert Paare (entry, blocks), wobei blocks() die
+    Daten des Eintrags blockweise liefert; die Daten müssen gelesen werden,
+    bevor der nächste Eintrag angefordert wird.
+    """
+    import libarchive
+    with libarchive.file_reader(filename) as archive:
+        for entry in archive:
+            yield entry, entry.get_blocks
+
+# Ausnahmen, bei denen tarfile statt eines Links eine Kopie anlegt
+_LINK_EXCEPTIONS = (AttributeError, NotImplementedError, OSError)
+
+def extract_entry_fast(extractor: ParallelExtractor, filename: str, name: str, entry, blocks):
+    """
+    Entpackt einen von open_archive_fast(filename) gelieferten Eintrag.
+
+    Lässt sich ein Link nicht anlegen (z. B. Symlinks unter Windows ohne
+    Berechtigung, oder ein Hardlink, dessen Ziel nicht entpackt wurde), wird
+    wie bei tarfile der Inhalt des Zieleintrags aus dem Archiv kopiert.
+    """
+    target = extractor.target(name)
+    if entry.isdir:
+        extractor.makedirs(target)
+    elif entry.isreg:
+        mode = stat.S_IMODE(entry.mode)
+        if entry.size >= extractor.INLINE_SIZE:
+            extractor.write_inline(name, blocks(), mode, entry.mtime)
+        else:
+            extractor.write(name, b"".join(blocks()), mode, entry.mtime)
+    elif entry.issym or entry.islnk:
+        extractor.makedirs(os.path.dirname(target))
+        # Ein Hardlink verweist auf eine bereits geschriebene Datei
+        extractor.wait()
+        if os.path.lexists(target):
+            os.remove(target)
+        if entry.issym:
+            # Symlinks sind relativ zu ihrem Verzeichnis im Archiv
+            member = "/".join(filter(None, (posixpath.dirname(name), entry.linkpath)))
+        else:
+            member = entry.linkpath
+        try:
+            if entry.issym:
+                os.symlink(entry.linkpath, target)
+            else:
+                os.link(extractor.target(entry.linkpath), target)
+        except _LINK_EXCEPTIONS:
+            _copy_member_fast(extractor, filename, posixpath.normpath(member), name)
+    else:
+        raise tarfile.ExtractError("unsupported archive entry type for %r" % name)
+
+def _copy_member_fast(extractor: ParallelExtractor, filename: str, member: str, name: str):
+    """Schreibt den Inhalt des Archiveintrags member unter dem Namen name."""
+    for entry, blocks in open_archive_fast(filename):
+        if posixpath.normpath(entry.pathname) == member:
+            if not entry.isreg:
+                break
+            extractor.write_inline(name, blocks(), stat.S_IMODE(entry.mode), entry.mtime)
+            return
+    raise tarfile.ExtractError("unable to resolve link %r inside archive" % name)
+
+class _PrefetchingReader(io.RawIOBase):
+    """
+    Liest eine Datei in einem Hintergrund-Thread blockweise voraus, damit
+    das Einlesen der komprimierten Daten und die Dekompression parallel laufen.
+    Unterstützt nur das Zurückspulen an den Dateianfang, wie es ZstdFile beim
+    Rückwärtssuchen benötigt.
+    """
+
+    def __init__(self, name, chunk_size=1 << 20, depth=4):
+        super().__init__()
+        self.name = name
+        self._chunk_size = chunk_size
+        self._depth = depth
+        self._file = open(name, "rb", buffering=0)
+        self._thread = None
+        self._start()
+
+    def _start(self):
+        """Startet den Hintergrund-Thread ab der aktuellen Dateiposition."""
+        self._queue = queue.Queue(maxsize=self._depth)
+        self._stop = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._error = None
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _halt(self):
+        """Beendet den Hintergrund-Thread und verwirft vorausgelesene Daten."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        while self._thread.is_alive():
+            # Die Warteschlange leeren, damit ein blockiertes put() zurückkehrt
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._thread.join(0.01)
+        self._thread = None
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _fill(self):
+        try:
+            while True:
+                chunk = self._file.read(self._chunk_size)
+                if not self._put(chunk) or not chunk:
+                    return
+        except Exception as err:
+            # Fehler für alle weiteren Lesezugriffe festhalten und den
+            # lesenden Thread aufwecken
+            self._error = err
+            self._put(err)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._pending:
+            if self._eof:
+                return 0
+            item = self._next_item()
+            if isinstance(item, Exception):
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._pending = memoryview(item)
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def _next_item(self):
+        """Holt den nächsten Block; blockiert nicht, wenn der Thread beendet ist."""
+        while True:
+            if self._error is not None:
+                raise self._error
+            try:
+                return self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if not self._thread.is_alive() and self._queue.empty():
+                    if self._error is not None:
+                        raise self._error
+                    raise OSError("prefetch thread for %s stopped" % self.name)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("can only rewind to the beginning")
+        self._halt()
+        self._file.seek(0)
+        self._start()
+        return 0
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._halt()
+            finally:
+                self._file.close()
+        super().close()
+
 class ZstdTarFile(tarfile.TarFile):
     """Spezialisiert für den Umgang mit Zstandard-komprimierten TAR-Dateien."""
+
+    # Puffergröße für das Lesen: tarfile liest in 512-Byte-Blöcken, die sonst
+    # jeweils einzeln durch ZstdFile.read() laufen würden
+    READ_BUFFER_SIZE = 1 << 20
+
     def __init__(self, name, mode='r', *, level=4, zstd_dict=None, **kwargs):
         from pyzstd import CParameter, ZstdFile  # Importiert Zstandard-Parameter und -Dateien
         zstdoption = None
-        if mode != 'r' and mode != 'rb':
+        reading = mode in ('r', 'rb')
+        if not reading:
             # Setzt Zstandard-Komprimierungsoptionen
             zstdoption = {CParameter.compressionLevel: level,
                           CParameter.nbWorkers: multiprocessing.cpu_count(),
                           CParameter.checksumFlag: 1}
-        # Öffnet die Zstandard-Datei
-        self.zstd_file = ZstdFile(name, mode,
-                                  level_or_option=zstdoption,
-                                  zstd_dict=zstd_dict)
+        self._prefetcher = None
+        if reading and isinstance(name, (str, bytes, os.PathLike)):
+            # Komprimierte Daten im Hintergrund vorauslesen
+            self._prefetcher = name = _PrefetchingReader(name)
+        try:
+            # Öffnet die Zstandard-Datei
+            self.zstd_file = ZstdFile(name, mode,
+                                      level_or_option=zstdoption,
+                                      zstd_dict=zstd_dict)
+        except:
+            self._close_prefetcher()
+            raise
+        if reading:
+            # Große Lesepuffer vor die Dekompression schalten, damit die kleinen
+            # Lesezugriffe von tarfile aus dem C-Puffer bedient werden
+            self.zstd_file = io.BufferedReader(self.zstd_file,
+                                               buffer_size=self.READ_BUFFER_SIZE)
         try:
             # Initialisiert das TAR-Archiv mit der Zstandard-Datei als Quelle
             super().__init__(fileobj=self.zstd_file, mode=mode, **kwargs)
         except:
             self.zstd_file.close()  # Schließt die Datei bei Fehlern
+            self._close_prefetcher()
             raise
 
+    def _close_prefetcher(self):
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+
     def close(self):
         """Schließt sowohl das TAR-Archiv als auch die Zstandard-Datei."""
         try:
             super().close()
         finally:
-            self.zstd_file.close()
+            try:
+                self.zstd_file.close()
+            finally:
+                self._close_prefetcher()
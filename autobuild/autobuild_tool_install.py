@@ -10,10 +10,12 @@ from __future__ import annotations
 
 import errno
 import http.client
+import io
 import logging
 import os
 import pprint
 import sys
+import tarfile
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -458,8 +460,13 @@ class ExtractPackageResults:
 
 
 def extract_package(package_file: str, install_dir: str, dry_run: bool = False) -> ExtractPackageResults:
+    if archive_utils.has_libarchive():
+        results = _extract_package_libarchive(package_file, install_dir, dry_run=dry_run)
+        if results is not None:
+            return results
     with archive_utils.open_archive(package_file) as archive:
         results = ExtractPackageResults()
+        members = []
         for t in archive:
             if t.name == configfile.PACKAGE_METADATA_FILE:
                 f = archive.extractfile(t)
@@ -470,13 +477,58 @@ def extract_package(package_file: str, install_dir: str, dry_run: bool = False)
                     results.conflicts.append(t_path)
                     continue
 
-                if not dry_run:
-                    archive.extract(t.name, install_dir)
-
+                members.append(t)
                 results.files.append(t.name)
+
+        if not dry_run:
+            if isinstance(archive, tarfile.TarFile):
+                archive_utils.extractall_parallel(archive, install_dir, members)
+            else:
+                for t in members:
+                    archive.extract(t, install_dir)
         return results
 
 
+def _extract_package_libarchive(package_file: str, install_dir: str, dry_run: bool = False) -> ExtractPackageResults | None:
+    """
+    Same as the tarfile-based path of extract_package(), but reads the archive
+    in a single pass with libarchive, which handles every supported format.
+
+    Returns None if libarchive fails before anything was written (e.g. the
+    system libarchive lacks the needed decompression filter), so that the
+    caller can fall back to the tarfile path.
+    """
+    import libarchive
+
+    results = ExtractPackageResults()
+    written = False
+    try:
+        with archive_utils.ParallelExtractor(install_dir) as extractor:
+            for entry, blocks in archive_utils.open_archive_fast(package_file):
+                # tarfile reports directories without their trailing slash;
+                # keep the installed manifest identical
+                name = entry.pathname.rstrip("/") if entry.isdir else entry.pathname
+                if name == configfile.PACKAGE_METADATA_FILE:
+                    results.metadata = configfile.MetadataDescription(stream=io.BytesIO(b"".join(blocks())))
+                    continue
+                t_path = os.path.join(install_dir, name)
+                if os.path.exists(t_path) and not os.path.isdir(t_path) and name not in results.files:
+                    results.conflicts.append(t_path)
+                    continue
+
+                if not dry_run:
+                    written = True
+                    archive_utils.extract_entry_fast(extractor, package_file, name, entry, blocks)
+
+                results.files.append(name)
+    except libarchive.ArchiveError as err:
+        if written:
+            raise
+        logger.info("libarchive can't read %s (%s); falling back to tarfile", package_file, err)
+        return None
+    return results
+
+
 def _install_common(configured_name: str, platform: str, package: configfile.PackageDescription, package_file: str, install_dir: str,  installed: configfile.Dependencies, dry_run: bool):
 
     # Compare installed package hash to new hash, uninstall the existing one if they do not match
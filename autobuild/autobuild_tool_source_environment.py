@@ -239,7 +239,8 @@ def load_vsvars(vsver):
             # Any environment variable from our batch script that's identical
             # to our own os.environ was simply inherited. Discard it.
             del vcvars[var]
-    logger.debug("set by %s %s:\n%s" % (vcvarsall, arch, pformat(vcvars)))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("set by %s %s:\n%s", vcvarsall, arch, pformat(vcvars))
 
     return vcvars
 
@@ -307,7 +308,8 @@ call "%s"%s
         logger.debug("pprint output of %s:\n%s" % (batpath, raw_environ))
         raise
 
-    logger.debug("environment from %s:\n%s" % (batpath, pformat(vsvars)))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("environment from %s:\n%s", batpath, pformat(vsvars))
     return vsvars
 
 
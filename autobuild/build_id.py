@@ -26,8 +26,9 @@ def establish_build_id(build_id_arg, config: ConfigurationDescription):
 
 
 def get_build_id(config: "ConfigurationDescription") -> str:
-    if 'AUTOBUILD_BUILD_ID' in os.environ:
-        return os.environ['AUTOBUILD_BUILD_ID']
+    build_id = os.environ.get('AUTOBUILD_BUILD_ID')
+    if build_id is not None:
+        return build_id
 
     if config.package_description.use_scm_version:
         config_dir = os.path.dirname(config.path)
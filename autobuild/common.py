@@ -7,6 +7,7 @@ other autobuild module.
 """
 from __future__ import annotations
 
+import fnmatch
 import hashlib
 import itertools
 import logging
@@ -14,12 +15,13 @@ import multiprocessing
 import os
 import platform
 import pprint
+import re
 import subprocess
 import sys
 import tarfile
 import tempfile
 from collections import OrderedDict
-from functools import partial
+from functools import lru_cache, partial
 from typing import Callable
 
 from autobuild.version import AUTOBUILD_VERSION_STRING
@@ -181,9 +183,11 @@ def get_version_tuple(version_string):
         # Treat any unparseable version as "very old"
         return (0,)
 
+@lru_cache(maxsize=None)
 def get_current_user():
     """
-    Get the login name for the current user.
+    Get the login name for the current user. The login name can't change
+    within a process, so it is looked up only once.
     """
     try:
         # Unix-only.
@@ -216,8 +220,7 @@ def get_install_cache_dir():
     if cache is None:
         cache = get_temp_dir("install.cache")
     else:
-        if not os.path.exists(cache):
-            os.makedirs(cache, mode=0o755)
+        os.makedirs(cache, mode=0o755, exist_ok=True)
     return cache
 
 
@@ -233,8 +236,7 @@ def get_temp_dir(basename):
         tmpdir = os.path.join(tempfile.gettempdir(), installdir)
     else:
         tmpdir = "/var/tmp/%s/%s" % (user, basename)
-    if not os.path.exists(tmpdir):
-        os.makedirs(tmpdir, mode=0o755)
+    os.makedirs(tmpdir, mode=0o755, exist_ok=True)
     return tmpdir
 
 
@@ -299,12 +301,33 @@ def find_executable(executables, exts=None, path=None):
     # 'foo'] it means that if foobar exists on this platform, we need to
     # prioritize that over plain 'foo' -- even if the directory containing
     # plain 'foo' comes first. So the outer loop should be over 'executables'.
+    # Directory listings are only needed to expand wildcards; list each
+    # directory at most once per call no matter how many names use them.
+    listings = {}
+    def listing(p):
+        try:
+            return listings[p]
+        except KeyError:
+            try:
+                names = sorted(os.listdir(p))
+            except OSError:
+                names = []
+            listings[p] = names
+            return names
+
     for e in executables:
+        has_wildcard = any(c in e for c in "*?[")
         for p in path:
             for ext in itertools.chain(exts, [""]):
-                candidate = os.path.join(p, e + ext)
-                if os.path.isfile(candidate):
-                    return candidate
+                if not has_wildcard:
+                    candidate = os.path.join(p, e + ext)
+                    if os.path.isfile(candidate):
+                        return candidate
+                    continue
+                for name in fnmatch.filter(listing(p), e + ext):
+                    candidate = os.path.join(p, name)
+                    if os.path.isfile(candidate):
+                        return candidate
     return None
 
 
@@ -321,26 +344,89 @@ def dedup_path(path, sep=os.pathsep):
     return sep.join(OrderedDict((dir.rstrip(r'\/'), 1) for dir in path.split(sep)))
 
 
+_HASH_BUFFER_SIZE = 1 << 20
+
+
+def _update_hash(f, h, buf: bytearray):
+    """Stream an unbuffered file into hash h through the caller's buffer"""
+    view = memoryview(buf)
+    n = f.readinto(buf)
+    while n:
+        h.update(view[:n])
+        n = f.readinto(buf)
+    return h
+
+
 def compute_hash(path: str, hash: Callable[[], hashlib._Hash]):
     """
     Compute a hash for a file effeciently by streaming it into the hash algorithm
     """
     h = hash()
     try:
-        with open(path, 'rb') as f:
-            chunk = f.read(8192)
-            while chunk:
-                h.update(chunk)
-                chunk = f.read(8192)
-            return h.hexdigest()
+        with open(path, 'rb', buffering=0) as f:
+            file_digest = getattr(hashlib, 'file_digest', None)
+            if file_digest is not None:
+                # Python 3.11+: let hashlib drive the read loop
+                return file_digest(f, lambda: h).hexdigest()
+            # Reuse one buffer instead of allocating a new chunk per read
+            return _update_hash(f, h, bytearray(_HASH_BUFFER_SIZE)).hexdigest()
     except IOError as err:
         raise AutobuildError(f"Can't compute {h.name} for {path}: {err}")
 
 
+def compute_hash_many(paths, hash: Callable[[], hashlib._Hash]):
+    """
+    Generate (path, hexdigest) for each of several files, reading all of them
+    through a single buffer rather than allocating one per file
+    """
+    buf = bytearray(_HASH_BUFFER_SIZE)
+    for path in paths:
+        h = hash()
+        try:
+            with open(path, 'rb', buffering=0) as f:
+                yield path, _update_hash(f, h, buf).hexdigest()
+        except IOError as err:
+            raise AutobuildError(f"Can't compute {h.name} for {path}: {err}")
+
+
 compute_md5 = partial(compute_hash, hash=hashlib.md5)
 compute_blake2b = partial(compute_hash, hash=hashlib.blake2b)
 compute_sha1 = partial(compute_hash, hash=hashlib.sha1)
 compute_sha256 = partial(compute_hash, hash=hashlib.sha256)
+compute_md5_many = partial(compute_hash_many, hash=hashlib.md5)
+
+
+def compute_blake3(path: str):
+    """
+    Compute a BLAKE3 hash for a file. This needs the optional 'blake3' package
+    (pip install autobuild[blake3]), which memory-maps the file and hashes it
+    on multiple threads.
+    """
+    try:
+        import blake3
+    except ImportError:
+        raise AutobuildError("Can't compute blake3 for %s: the 'blake3' package is not installed" % path)
+    h = blake3.blake3(max_threads=blake3.blake3.AUTO)
+    try:
+        h.update_mmap(path)
+    except IOError as err:
+        raise AutobuildError(f"Can't compute blake3 for {path}: {err}")
+    return h.hexdigest()
+
+
+# Archive names look like "boost-1.39.0-darwin-20100222a.tar.bz2". The name,
+# platform and build id never contain '-', so any extra dashes (as in
+# "version numbers" like "2009-08-30", "1-0" or "1.2-alpha") belong to the
+# version. The extension starts at the first '.' after the build id: we can't
+# use os.path.splitext(), which would split "woof.tar.bz2" into ('woof.tar',
+# '.bz2'), nor split on '.' earlier, since versions contain dots.
+_TARNAME_RE = re.compile(r"""
+    (?P<name>[^-]*)-
+    (?P<version>.*)-
+    (?P<platform>[^-]*)-
+    (?P<build>[^-.]*)
+    (?P<ext>(?:\.[^-]*)?)
+    \Z""", re.VERBOSE | re.DOTALL)
 
 
 def split_tarname(pathname):
@@ -352,41 +438,12 @@ def split_tarname(pathname):
     """
     # Split off the directory name from the unqualified filename.
     dir, filename = os.path.split(pathname)
-    # dir = "/some/path"
-    # filename = "boost-1.39.0-darwin-20100222a.tar.bz2"
-    # Conceptually we want to split off the extension at this point. It would
-    # be great to use os.path.splitext(). Unfortunately, at least as of Python
-    # 2.5, os.path.splitext("woof.tar.bz2") returns ('woof.tar', '.bz2') --
-    # not what we want. Instead, we'll have to split on '.'. But as the
-    # docstring example points out, doing that too early would confuse things,
-    # as there are dot characters in the embedded version number. So we have
-    # to split on '-' FIRST.
-    fileparts = filename.split('-')
-    # fileparts = ["boost", "1.39.0", "darwin", "20100222a.tar.bz2"]
-    # Almost there -- we just have to lop off the extension. NOW split on '.'.
-    # We know there's at least fileparts[-1] because splitting a string with
-    # no '-' -- even the empty string -- produces a list containing the
-    # original string.
-    extparts = fileparts[-1].split('.')
-    # extparts = ["20100222a", "tar", "bz2"]
-    # Replace the last entry in fileparts with the first part of extparts.
-    fileparts[-1] = extparts[0]
-    # Now fileparts = ["boost", "1.39.0", "darwin", "20100222a"] as desired.
-    # Reconstruct the extension. To preserve the leading '.', don't just
-    # delete extparts[0], replace it with the empty string. Yes, this does
-    # assume that split() returns a list.
-    extparts[0] = ""
-    ext = '.'.join(extparts)
-    # One more funky case. We've encountered "version numbers" like
-    # "2009-08-30", "1-0" or "1.2-alpha". This would produce too many
-    # fileparts, e.g. ["boost", "2009", "08", "30", "darwin", "20100222a"].
-    # Detect that and recombine.
-    if len(fileparts) > 4:
-        fileparts[1:-2] = ['-'.join(fileparts[1:-2])]
-    if len(fileparts) < 4:
+    match = _TARNAME_RE.match(filename)
+    if match is None:
         raise AutobuildError("Incompatible archive name '%s' lacks some components" \
                              % filename)
-    return dir, fileparts, ext
+    name, version, platform, build, ext = match.groups()
+    return dir, [name, version, platform, build], ext
 
 
 def search_up_for_file(path):
@@ -406,6 +463,9 @@ def search_up_for_file(path):
     return os.path.abspath(os.path.join(dir, filename))
 
 
+_MISSING = object()
+
+
 class Serialized(dict, object):
     """
     A base class for serialized objects.  Regular attributes are stored in the inherited dictionary
@@ -413,13 +473,14 @@ class Serialized(dict, object):
     """
 
     def __getattr__(self, name):
-        if name in self:
-            return self[name]
-        else:
+        # single dict probe instead of 'in' followed by '[]'
+        value = dict.get(self, name, _MISSING)
+        if value is _MISSING:
             raise AttributeError("object has no attribute '%s'" % name)
+        return value
 
     def __setattr__(self, name, value):
-        if name in self.__class__.__dict__:
+        if name in type(self).__dict__:
             self.__dict__[name] = value
         else:
             self[name] = value
@@ -492,11 +553,17 @@ def select_configurations(args, config, verb):
     if args.all:
         configurations = config.get_all_build_configurations(platform)
     elif args.configurations:
-        configurations = [config.get_build_configuration(name, platform)
+        # Resolve the platform once instead of once per requested name; let
+        # get_build_configuration() report any name that isn't there.
+        available = config.get_platform(platform).configurations
+        configurations = [available[name] if name in available
+                          else config.get_build_configuration(name, platform)
                           for name in args.configurations]
     else:
         configurations = config.get_default_build_configurations(platform)
-    logger.debug("common.select_configurations %s configuration(s)\n%s" % (verb, pprint.pformat(configurations)))
+    if logger.isEnabledFor(logging.DEBUG):
+        # pformat() walks the whole configuration graph; skip it unless shown
+        logger.debug("common.select_configurations %s configuration(s)\n%s", verb, pprint.pformat(configurations))
     return configurations
 
 
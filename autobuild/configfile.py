@@ -465,7 +465,8 @@ class MetadataDescription(common.Serialized):
             del package['manifest']
             if 'dirty' in package and package['dirty']:
                 self.dirty=True
-            logger.debug("adding '%s':\n%s"%(name, pprint.pformat(package)))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("adding '%s':\n%s", name, pprint.pformat(package))
             self.dependencies[name] = package
 
     def save(self):
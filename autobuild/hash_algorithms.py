@@ -1,9 +1,17 @@
 """
 Implementations for various values of configfile.ArchiveDescription.hash_algorithm
 """
+import hashlib
+import json
+import logging
+import os
+import sys
+
 from autobuild import common
 from autobuild.common import AutobuildError
 
+logger = logging.getLogger(__name__)
+
 # Valid configfile.ArchiveDescription.hash_algorithm values are registered
 # here by means of the @hash_algorithm decorator.
 REGISTERED_ALGORITHMS = {}
@@ -59,9 +67,78 @@ def verify_hash(hash_algorithm, pathname, hash):
     # The final comparison should be case insensitive
     hash = hash.lower()
 
+    # A file we already verified against this hash, and which hasn't changed
+    # since, needn't be hashed again. Take the file state *before* hashing, so
+    # that a change made while we hash is never recorded as verified.
+    state = _file_state(hash_algorithm, pathname, hash)
+    if _is_verified(pathname, state):
+        return True
+
     # Apparently we do have a function to support this hash_algorithm. Call
     # it.
-    return function(pathname, hash)
+    if not function(pathname, hash):
+        return False
+    _record_verified(pathname, state)
+    return True
+
+
+# Successful verifications are remembered in the install cache, keyed by the
+# file's path and checked against its size, inode, and modification and
+# inode change times, so that unchanged package archives aren't rehashed on
+# every autobuild run. On POSIX the inode change time can't be set through
+# utime(), so copying different bytes in with 'cp -p' or 'touch -r' still
+# invalidates the record. On Windows st_ctime is the creation time, which a
+# rewrite in place doesn't change, so there is no trustworthy change signal
+# and records are never used. Set AUTOBUILD_HASH_CACHE=false to always hash.
+_HASH_CACHE_SUPPORTED = sys.platform != "win32"
+
+def _verified_record_path(pathname):
+    key = hashlib.sha1(os.path.realpath(pathname).encode("utf-8", "surrogateescape")).hexdigest()
+    return os.path.join(common.get_install_cache_dir(), "verified", key + ".json")
+
+
+def _file_state(hash_algorithm, pathname, hash):
+    """Return the record describing pathname now, or None if it isn't cacheable"""
+    if not _HASH_CACHE_SUPPORTED or common.is_env_disabled("AUTOBUILD_HASH_CACHE"):
+        return None
+    try:
+        st = os.stat(pathname)
+    except OSError:
+        # let the hash function report the problem
+        return None
+    return dict(path=os.path.realpath(pathname), hash_algorithm=hash_algorithm, hash=hash,
+                size=st.st_size, dev=st.st_dev, ino=st.st_ino,
+                mtime_ns=st.st_mtime_ns, ctime_ns=st.st_ctime_ns)
+
+
+def _is_verified(pathname, state):
+    if state is None:
+        return False
+    try:
+        with open(_verified_record_path(pathname)) as f:
+            record = json.load(f)
+        return record == state
+    except (OSError, ValueError):
+        return False
+
+
+def _record_verified(pathname, state):
+    if state is None:
+        return
+    # The file changed while we hashed it: what we verified isn't this state.
+    if _file_state(state["hash_algorithm"], pathname, state["hash"]) != state:
+        return
+    try:
+        record_path = _verified_record_path(pathname)
+        os.makedirs(os.path.dirname(record_path), exist_ok=True)
+        # write then rename, so a concurrent reader never sees a partial record
+        temp_path = "%s.%d.tmp" % (record_path, os.getpid())
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_path, record_path)
+    except OSError as err:
+        # the record only saves time later; failing to write it is harmless
+        logger.debug("can't record verified hash for %s: %s", pathname, err)
 
 
 @hash_algorithm("md5")
@@ -82,3 +159,8 @@ def verify_sha1(pathname, hash):
 @hash_algorithm("sha256")
 def verify_sha256(pathname, hash):
     return common.compute_sha256(pathname) == hash
+
+
+@hash_algorithm("blake3")
+def verify_blake3(pathname, hash):
+    return common.compute_blake3(pathname) == hash
@@ -32,8 +32,10 @@ setuptools.setup(
     ],
     install_requires=['llsd>=1.2.4', 'pydot', 'pyzstd'],
     extras_require={
-        'dev': ['pytest', 'pytest-cov'],
+        'dev': ['pytest', 'pytest-cov', 'blake3'],
         'build': ['build', 'setuptools_scm'],
+        'blake3': ['blake3'],
+        'libarchive': ['libarchive-c'],
     },
     python_requires='>=3.7',
 )
@@ -1,5 +1,11 @@
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+
 from autobuild import common
-from tests.basetest import BaseTest
+from tests.basetest import BaseTest, temp_dir
 
 
 class TestCommon(BaseTest):
@@ -14,5 +20,52 @@ class TestCommon(BaseTest):
         exe_path = common.find_executable(shell)
         assert exe_path != None
 
+    def test_find_executable_wildcard(self):
+        with temp_dir() as dir:
+            for name in ("tool-1.2", "tool-1.3.cmd"):
+                open(os.path.join(dir, name), "w").close()
+            os.mkdir(os.path.join(dir, "tool-dir"))
+            self.assertEqual(common.find_executable("tool-1.*", exts=[], path=[dir]),
+                             os.path.join(dir, "tool-1.2"))
+            self.assertEqual(common.find_executable("tool-1.*", exts=[".cmd"], path=[dir]),
+                             os.path.join(dir, "tool-1.3.cmd"))
+            self.assertIsNone(common.find_executable("tool-d*", exts=[], path=[dir]))
+
+    def test_split_tarname(self):
+        self.assertEqual(common.split_tarname("/some/path/boost-1.39.0-darwin-20100222a.tar.bz2"),
+                         ("/some/path", ["boost", "1.39.0", "darwin", "20100222a"], ".tar.bz2"))
+        self.assertEqual(common.split_tarname("boost-2009-08-30-darwin64-111.tar.zst"),
+                         ("", ["boost", "2009-08-30", "darwin64", "111"], ".tar.zst"))
+        self.assertEqual(common.split_tarname("boost-1.2-alpha-common-111"),
+                         ("", ["boost", "1.2-alpha", "common", "111"], ""))
+        with self.assertRaises(common.AutobuildError):
+            common.split_tarname("boost-darwin-111.tar.bz2")
+
+    def test_compute_md5(self):
+        path = os.path.join(self.this_dir, "data", "archive.tar.bz2")
+        with open(path, "rb") as f:
+            expected = hashlib.md5(f.read()).hexdigest()
+        self.assertEqual(common.compute_md5(path), expected)
+        # exercise the readinto() loop used where hashlib.file_digest() is missing
+        with patch.object(common, "_HASH_BUFFER_SIZE", 64), \
+             patch.object(hashlib, "file_digest", None, create=True):
+            self.assertEqual(common.compute_md5(path), expected)
+
+    def test_compute_md5_many(self):
+        paths = [os.path.join(self.this_dir, "data", name)
+                 for name in ("archive.tar.bz2", "archive.tar.gz", "archive.zip")]
+        with patch.object(common, "_HASH_BUFFER_SIZE", 64):
+            results = list(common.compute_md5_many(paths))
+        self.assertEqual(results, [(path, common.compute_md5(path)) for path in paths])
+        with self.assertRaises(common.AutobuildError):
+            list(common.compute_md5_many([os.path.join(self.this_dir, "data", "missing")]))
+
+    def test_compute_blake3(self):
+        blake3 = pytest.importorskip("blake3")
+        path = os.path.join(self.this_dir, "data", "archive.tar.bz2")
+        with open(path, "rb") as f:
+            expected = blake3.blake3(f.read()).hexdigest()
+        self.assertEqual(common.compute_blake3(path), expected)
+
     def tearDown(self):
         BaseTest.tearDown(self)
@@ -1,6 +1,10 @@
+import io
+import os
 import shutil
+import tarfile
 from os import path
 from pathlib import Path
+from unittest.mock import patch
 from tests.basetest import temp_dir
 
 import pytest
@@ -30,3 +34,193 @@ def test_detect_from_signature(filename, expected_type):
         shutil.copyfile(filename, filename_no_ext)
         f_type = archive_utils.detect_archive_type(filename_no_ext)
         assert f_type == expected_type
+
+
+def test_detect_unknown_signature():
+    with temp_dir() as dir:
+        filename = Path(dir) / "archive"
+        filename.write_bytes(b"\x00\x01")
+        assert archive_utils.detect_archive_type(str(filename)) is None
+
+
+def test_detect_from_signature_after_rewrite():
+    with temp_dir() as dir:
+        filename = Path(dir) / "archive"
+        shutil.copyfile(_ARCHIVE_TEST_CASES[0][0], filename)
+        assert archive_utils.detect_archive_type(str(filename)) == archive_utils.ArchiveType.BZ2
+        # a changed file must not be served from the signature cache
+        shutil.copyfile(_ARCHIVE_TEST_CASES[3][0], filename)
+        assert archive_utils.detect_archive_type(str(filename)) == archive_utils.ArchiveType.ZIP
+
+
+def test_zstd_read_after_rewind():
+    with temp_dir() as dir:
+        filename = str(Path(dir) / "big.tar.zst")
+        payloads = [os.urandom(3 << 20) for _ in range(2)]
+        with archive_utils.ZstdTarFile(filename, "w") as archive:
+            for i, data in enumerate(payloads):
+                info = tarfile.TarInfo("file%d" % i)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        with archive_utils.open_archive(filename) as archive:
+            members = archive.getmembers()
+            # reading a member behind the read buffer rewinds the stream
+            assert archive.extractfile(members[0]).read() == payloads[0]
+            assert archive.extractfile(members[1]).read() == payloads[1]
+
+
+def test_extractall_parallel():
+    filename = path.join(_DATA_DIR, "bogus-0.1-common-111.tar.bz2")
+    with temp_dir() as dir, archive_utils.open_archive(filename) as archive:
+        archive_utils.extractall_parallel(archive, dir, max_workers=2)
+        for member in archive.getmembers():
+            extracted = Path(dir) / member.name
+            if member.isreg():
+                assert extracted.read_bytes() == archive.extractfile(member).read()
+            else:
+                assert extracted.is_dir()
+
+
+def test_extractall_parallel_outside_destination():
+    with temp_dir() as dir:
+        filename = str(Path(dir) / "evil.tar")
+        with tarfile.open(filename, "w") as archive:
+            info = tarfile.TarInfo("../evil")
+            archive.addfile(info, io.BytesIO())
+        with archive_utils.open_archive(filename) as archive:
+            with pytest.raises(tarfile.ExtractError):
+                archive_utils.extractall_parallel(archive, str(Path(dir) / "dest"))
+
+
+def test_detect_empty_file():
+    with temp_dir() as dir:
+        filename = Path(dir) / "archive"
+        filename.write_bytes(b"")
+        assert archive_utils.detect_archive_type(str(filename)) is None
+
+
+@pytest.mark.parametrize("filename", [
+    path.join(_DATA_DIR, "bogus-0.1-common-111.tar.bz2"),
+    path.join(_DATA_DIR, "bogus-0.1-common-111.tar.zst"),
+])
+def test_open_archive_fast_matches_tarfile(filename):
+    pytest.importorskip("libarchive")
+    with archive_utils.open_archive(filename) as archive:
+        expected = {m.name: archive.extractfile(m).read() for m in archive if m.isreg()}
+    found = {entry.pathname: b"".join(blocks())
+             for entry, blocks in archive_utils.open_archive_fast(filename) if entry.isreg}
+    assert found == expected
+
+
+def test_extract_entry_fast_links():
+    pytest.importorskip("libarchive")
+    with temp_dir() as dir:
+        filename = str(Path(dir) / "links.tar")
+        with tarfile.open(filename, "w") as archive:
+            info = tarfile.TarInfo("lib/libfoo.so.1")
+            info.size = 3
+            archive.addfile(info, io.BytesIO(b"foo"))
+            info = tarfile.TarInfo("lib/libfoo.so")
+            info.type, info.linkname = tarfile.SYMTYPE, "libfoo.so.1"
+            archive.addfile(info)
+            info = tarfile.TarInfo("lib/libfoo.hard")
+            info.type, info.linkname = tarfile.LNKTYPE, "lib/libfoo.so.1"
+            archive.addfile(info)
+        dest = Path(dir) / "dest"
+        with archive_utils.ParallelExtractor(str(dest)) as extractor:
+            for entry, blocks in archive_utils.open_archive_fast(filename):
+                archive_utils.extract_entry_fast(extractor, filename, entry.pathname, entry, blocks)
+        assert os.readlink(dest / "lib" / "libfoo.so") == "libfoo.so.1"
+        assert (dest / "lib" / "libfoo.hard").read_bytes() == b"foo"
+
+
+def test_extractall_parallel_duplicate_entries():
+    with temp_dir() as dir:
+        filename = str(Path(dir) / "dup.tar")
+        with tarfile.open(filename, "w") as archive:
+            for data in (b"x" * (8 << 20), b"y" * 100, b"z" * 10):
+                info = tarfile.TarInfo("f")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        for _ in range(10):
+            dest = Path(dir) / "dest"
+            shutil.rmtree(dest, ignore_errors=True)
+            with archive_utils.open_archive(filename) as archive:
+                archive_utils.extractall_parallel(archive, str(dest), max_workers=4)
+            # archive order decides: the last entry wins
+            assert (dest / "f").read_bytes() == b"z" * 10
+
+
+def test_extractall_parallel_buffer_budget():
+    with temp_dir() as dir:
+        filename = str(Path(dir) / "many.tar")
+        payloads = {"file%d" % i: os.urandom(1000 + i) for i in range(50)}
+        with tarfile.open(filename, "w") as archive:
+            for name, data in payloads.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        # tiny limits push payloads through both the inline and budgeted paths
+        with patch.object(archive_utils.ParallelExtractor, "INLINE_SIZE", 1020), \
+             patch.object(archive_utils.ParallelExtractor, "BUFFER_BYTES", 3000), \
+             archive_utils.open_archive(filename) as archive:
+            archive_utils.extractall_parallel(archive, dir, max_workers=4)
+        for name, data in payloads.items():
+            assert (Path(dir) / name).read_bytes() == data
+
+
+def test_prefetching_reader_error_is_sticky():
+    class FailingFile:
+        def read(self, size):
+            raise OSError("injected")
+
+        def seek(self, offset):
+            pass
+
+        def close(self):
+            pass
+
+    filename = path.join(_DATA_DIR, "archive.tar.zst")
+    reader = archive_utils._PrefetchingReader(filename)
+    reader._halt()
+    reader._file.close()
+    reader._file = FailingFile()
+    reader._start()
+    try:
+        buf = bytearray(16)
+        for _ in range(2):
+            with pytest.raises(OSError, match="injected"):
+                reader.readinto(buf)
+    finally:
+        reader.close()
+
+
+def test_extract_entry_fast_link_fallbacks():
+    pytest.importorskip("libarchive")
+    with temp_dir() as dir:
+        filename = str(Path(dir) / "links.tar")
+        with tarfile.open(filename, "w") as archive:
+            info = tarfile.TarInfo("lib/libfoo.so.1")
+            info.size = 3
+            archive.addfile(info, io.BytesIO(b"foo"))
+            info = tarfile.TarInfo("lib/libfoo.so")
+            info.type, info.linkname = tarfile.SYMTYPE, "libfoo.so.1"
+            archive.addfile(info)
+            info = tarfile.TarInfo("lib/libfoo.hard")
+            info.type, info.linkname = tarfile.LNKTYPE, "lib/libfoo.so.1"
+            archive.addfile(info)
+        dest = Path(dir) / "dest"
+
+        def no_symlink(*args):
+            raise OSError("symbolic links not permitted")
+
+        with patch.object(os, "symlink", no_symlink), \
+             archive_utils.ParallelExtractor(str(dest)) as extractor:
+            for entry, blocks in archive_utils.open_archive_fast(filename):
+                # skip the link target, as extract_package does for conflicts
+                if entry.pathname != "lib/libfoo.so.1":
+                    archive_utils.extract_entry_fast(extractor, filename, entry.pathname, entry, blocks)
+        assert not (dest / "lib" / "libfoo.so.1").exists()
+        assert not (dest / "lib" / "libfoo.so").is_symlink()
+        assert (dest / "lib" / "libfoo.so").read_bytes() == b"foo"
+        assert (dest / "lib" / "libfoo.hard").read_bytes() == b"foo"
@@ -0,0 +1,86 @@
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from autobuild import common, hash_algorithms
+
+_ARCHIVE = Path(__file__).parent / "data" / "archive.tar.bz2"
+
+
+def _copy_archive(tmp_path, monkeypatch):
+    monkeypatch.setenv("AUTOBUILD_INSTALLABLE_CACHE", str(tmp_path / "cache"))
+    archive = tmp_path / "archive.tar.bz2"
+    shutil.copyfile(_ARCHIVE, archive)
+    return str(archive), common.compute_md5(str(archive))
+
+
+def test_verify_hash(tmp_path, monkeypatch):
+    archive, md5 = _copy_archive(tmp_path, monkeypatch)
+    assert hash_algorithms.verify_hash("md5", archive, md5.upper())
+    assert not hash_algorithms.verify_hash("md5", archive, "0" * 32)
+
+
+@pytest.mark.skipif(not hash_algorithms._HASH_CACHE_SUPPORTED,
+                    reason="verified-hash records are disabled on this platform")
+def test_verified_file_is_not_rehashed(tmp_path, monkeypatch):
+    archive, md5 = _copy_archive(tmp_path, monkeypatch)
+    assert hash_algorithms.verify_hash("md5", archive, md5)
+    with patch.object(common, "compute_md5") as compute_md5:
+        assert hash_algorithms.verify_hash("md5", archive, md5)
+        compute_md5.assert_not_called()
+
+
+def test_changed_file_is_rehashed(tmp_path, monkeypatch):
+    archive, md5 = _copy_archive(tmp_path, monkeypatch)
+    assert hash_algorithms.verify_hash("md5", archive, md5)
+    with open(archive, "ab") as f:
+        f.write(b"garbage")
+    assert not hash_algorithms.verify_hash("md5", archive, md5)
+
+
+def test_hash_cache_disabled(tmp_path, monkeypatch):
+    archive, md5 = _copy_archive(tmp_path, monkeypatch)
+    monkeypatch.setenv("AUTOBUILD_HASH_CACHE", "false")
+    assert hash_algorithms.verify_hash("md5", archive, md5)
+    assert not os.path.exists(tmp_path / "cache" / "verified")
+
+
+@pytest.mark.skipif(not hash_algorithms._HASH_CACHE_SUPPORTED,
+                    reason="verified-hash records are disabled on this platform")
+def test_same_size_and_mtime_is_rehashed(tmp_path, monkeypatch):
+    archive, md5 = _copy_archive(tmp_path, monkeypatch)
+    assert hash_algorithms.verify_hash("md5", archive, md5)
+    # swap in different bytes of the same size, restoring the old mtime
+    st = os.stat(archive)
+    with open(archive, "r+b") as f:
+        first = f.read(1)
+        f.seek(0)
+        f.write(bytes([first[0] ^ 0xff]))
+    os.utime(archive, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert not hash_algorithms.verify_hash("md5", archive, md5)
+
+
+def test_change_during_hashing_is_not_recorded(tmp_path, monkeypatch):
+    archive, md5 = _copy_archive(tmp_path, monkeypatch)
+    compute_md5 = common.compute_md5
+
+    def compute_then_touch(pathname):
+        result = compute_md5(pathname)
+        os.utime(pathname, ns=(0, 0))
+        return result
+
+    with patch.object(common, "compute_md5", compute_then_touch):
+        assert hash_algorithms.verify_hash("md5", archive, md5)
+    verified = tmp_path / "cache" / "verified"
+    assert not verified.exists() or not os.listdir(verified)
+
+
+@pytest.mark.skipif(hash_algorithms._HASH_CACHE_SUPPORTED,
+                    reason="verified-hash records are enabled on this platform")
+def test_hash_cache_unsupported(tmp_path, monkeypatch):
+    archive, md5 = _copy_archive(tmp_path, monkeypatch)
+    assert hash_algorithms.verify_hash("md5", archive, md5)
+    assert not os.path.exists(tmp_path / "cache" / "verified")
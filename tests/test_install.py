@@ -1,3 +1,4 @@
+import itertools
 import logging
 import os
 import posixpath
@@ -12,7 +13,7 @@ from threading import Thread
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
-from autobuild import autobuild_tool_install, autobuild_tool_uninstall, common
+from autobuild import archive_utils, autobuild_tool_install, autobuild_tool_uninstall, common
 from autobuild.autobuild_tool_install import CredentialsNotFoundError
 from tests.basetest import *
 
@@ -782,3 +783,31 @@ class TestDownloadPackage(unittest.TestCase):
         with envvar("AUTOBUILD_GITHUB_TOKEN", None):
             with self.assertRaises(CredentialsNotFoundError):
                 autobuild_tool_install.download_package("https://example.org/foo.tar.bz2", creds="github")
+
+
+class TestExtractPackageLibarchive(unittest.TestCase):
+    def setUp(self):
+        self.libarchive = pytest.importorskip("libarchive")
+        self.package = os.path.join(mydir, "data", "bogus-0.1-common-111.tar.zst")
+
+    def test_falls_back_to_tarfile(self):
+        def unreadable(filename):
+            raise self.libarchive.ArchiveError("Unrecognized archive format")
+            yield
+
+        with temp_dir() as dir, patch.object(archive_utils, "open_archive_fast", unreadable):
+            results = autobuild_tool_install.extract_package(self.package, dir)
+            self.assertIsNotNone(results.metadata)
+            for name in results.files:
+                self.assertTrue(os.path.exists(os.path.join(dir, name)), name)
+
+    def test_error_after_writing_is_raised(self):
+        original = archive_utils.open_archive_fast
+
+        def truncated(filename):
+            yield from itertools.islice(original(filename), 2)
+            raise self.libarchive.ArchiveError("Truncated input file")
+
+        with temp_dir() as dir, patch.object(archive_utils, "open_archive_fast", truncated):
+            with self.assertRaises(self.libarchive.ArchiveError):
+                autobuild_tool_install.extract_package(self.package, dir)